@@ -3,6 +3,14 @@ from tkinter import filedialog, messagebox, ttk, colorchooser
 from PIL import Image, ImageTk, ImageOps, ImageEnhance, ImageFilter, ImageDraw
 import threading
 import os
+import json
+import math
+
+# numpy opsional: hanya dibutuhkan untuk mode presisi tinggi (buffer float32)
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class ImageApp:
     def __init__(self, root):
@@ -23,6 +31,22 @@ class ImageApp:
         self.zoom_scale = 1.0       # Skala zoom saat ini
         self.is_processing = False  # Flag untuk menandai apakah sedang memproses
 
+        # Buffer kerja float32 (H x W x 3) untuk mode presisi tinggi.
+        # None jika mode nonaktif; float_dirty True jika buffer lebih baru dari img_processed.
+        # float_lossless True jika isi buffer persis sama dengan img_processed 8-bit
+        # (tidak di-reset oleh sync_processed, karena kuantisasi tidak mengubah buffer)
+        self.float_buf = None
+        self.float_dirty = False
+        self.float_lossless = True
+        self.float_history_limit = 3    # Maks. snapshot float32 (12 byte/piksel) di history undo
+        self.float_base = None      # Image yang menjadi sumber/hasil sinkronisasi terakhir float_buf
+        self.var_high_precision = tk.BooleanVar(value=False)
+
+        # Hasil metrik kualitas terakhir (dict siap export JSON) dan ukuran tile streaming
+        self.last_metrics = None
+        self.metrics_tile = 256     # Kelipatan 8 agar blok SSIM 8x8 tidak terpotong antar tile
+        self.tk_heatmap = None
+
         # Default warna untuk operasi boolean (RGB)
         self.bool_color = (255, 0, 0)
 
@@ -53,6 +77,13 @@ class ImageApp:
         self.btn_peek.bind("<ButtonPress-1>", self.peek_start)
         self.btn_peek.bind("<ButtonRelease-1>", self.peek_end)
 
+        # Toggle mode presisi tinggi (butuh numpy)
+        self.chk_precision = tk.Checkbutton(self.toolbar, text="🎯 Presisi Float32", variable=self.var_high_precision,
+                                            command=self.toggle_high_precision, bg="#e1e1e1", activebackground="#d9d9d9")
+        self.chk_precision.pack(side=tk.LEFT, padx=5)
+        if np is None:
+            self.chk_precision.config(state=tk.DISABLED)
+
         # --- 2. MAIN LAYOUT ---
         # Menggunakan PanedWindow horizontal: sidebar kiri dan canvas utama kanan
         self.main_paned = tk.PanedWindow(self.root, orient=tk.HORIZONTAL)
@@ -78,8 +109,10 @@ class ImageApp:
                                 yscrollcommand=self.v_scroll.set)
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        self.v_scroll.config(command=self.canvas.yview)
-        self.h_scroll.config(command=self.canvas.xview)
+        # Scroll lewat handler sendiri agar view float (hanya area terlihat) bisa dirender ulang
+        self.v_scroll.config(command=self.on_yscroll)
+        self.h_scroll.config(command=self.on_xscroll)
+        self.canvas.bind("<Configure>", lambda e: self.refresh_float_view())
 
         # Bind mouse wheel untuk zoom
         self.canvas.bind("<MouseWheel>", self.on_mousewheel)
@@ -181,7 +214,12 @@ class ImageApp:
         
         def worker():
             try:
+                # Operasi 8-bit butuh img_processed terbaru dari buffer float
+                if operation_func not in self.float_ops():
+                    self.sync_processed()
                 operation_func(*args, **kwargs)
+                # Jika operasi 8-bit mengganti img_processed, muat ulang buffer float
+                self.reload_float_buffer()
             except Exception as e:
                 # Pastikan messagebox dipanggil dari thread utama
                 self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
@@ -192,6 +230,124 @@ class ImageApp:
         thread = threading.Thread(target=worker, daemon=True)
         thread.start()
 
+    # -------------------------------------------------------------
+    # NEW FEATURE: HIGH PRECISION (FLOAT32 WORKING BUFFER)
+    # -------------------------------------------------------------
+    def float_ops(self):
+        """Daftar operasi yang bekerja langsung pada buffer float (tanpa kuantisasi 8-bit)"""
+        return (self.op_math, self.op_brightness, self.op_contrast, self.op_saturation, self.op_sharpness)
+
+    def toggle_high_precision(self):
+        """Aktif/nonaktifkan buffer float32.
+        - Aktif: salin img_processed ke buffer float32
+        - Nonaktif: kuantisasi buffer kembali ke img_processed lalu buang buffer"""
+        if self.is_processing:
+            # Jangan ganti buffer saat operasi masih berjalan di thread lain
+            self.var_high_precision.set(self.float_buf is not None)
+            messagebox.showwarning("Processing", "Please wait for current operation to complete.")
+            return
+        if self.var_high_precision.get():
+            if self.img_processed:
+                self.float_base = None
+                self.reload_float_buffer(force=True)
+        else:
+            self.sync_processed()
+            self.float_buf = None
+            self.float_base = None
+        self.update_image_info()
+
+    def reload_float_buffer(self, force=False):
+        """Muat ulang buffer float dari img_processed jika img_processed diganti oleh operasi 8-bit"""
+        if not self.var_high_precision.get() or not self.img_processed: return
+        if force or self.img_processed is not self.float_base:
+            self.float_buf = np.array(self.img_processed, dtype=np.float32)
+            self.float_base = self.img_processed
+            self.float_dirty = False
+            self.float_lossless = True
+
+    def sync_processed(self):
+        """Kuantisasi seluruh buffer float ke img_processed (hanya jika buffer lebih baru).
+        Dipanggil sebelum save, sebelum operasi 8-bit, dan saat mode dinonaktifkan"""
+        if self.float_buf is not None and self.float_dirty:
+            self.img_processed = self.quantize(self.float_buf)
+            self.float_base = self.img_processed
+            self.float_dirty = False
+            # Canvas hanya berisi area terlihat dari view float: render ulang gambar penuh
+            self.root.after(0, self.display_image)
+
+    def quantize(self, arr):
+        """Bulatkan dan clamp array float ke uint8, kembalikan sebagai PIL Image RGB"""
+        out = np.rint(arr)
+        np.clip(out, 0, 255, out=out)
+        return Image.fromarray(out.astype(np.uint8), "RGB")
+
+    def float_luma(self):
+        """Luma (ITU-R 601-2, sama dengan konversi mode L Pillow) dari buffer float, bentuk H x W"""
+        buf = self.float_buf
+        return buf[..., 0] * 0.299 + buf[..., 1] * 0.587 + buf[..., 2] * 0.114
+
+    def mark_float_changed(self):
+        """Tandai buffer float berubah lalu render ulang di thread utama"""
+        self.float_dirty = True
+        self.float_lossless = False
+        self.root.after(0, self.display_image)
+        self.root.after(0, self.update_image_info)
+
+    def on_xscroll(self, *args):
+        """Scroll horizontal canvas lalu render ulang area terlihat (mode float)"""
+        self.canvas.xview(*args)
+        self.refresh_float_view()
+
+    def on_yscroll(self, *args):
+        """Scroll vertikal canvas lalu render ulang area terlihat (mode float)"""
+        self.canvas.yview(*args)
+        self.refresh_float_view()
+
+    def refresh_float_view(self):
+        """Render ulang hanya jika tampilan berasal dari buffer float (hanya area terlihat yang dirender).
+        Dilewati saat operasi berjalan: buffer sedang diubah in-place oleh worker, dan
+        mark_float_changed akan merender hasil akhirnya"""
+        if self.is_processing: return
+        if self.float_buf is not None and self.float_dirty:
+            self.display_image()
+
+    def display_float_view(self):
+        """Render buffer float ke canvas dengan kuantisasi hanya pada area yang terlihat.
+        - Area canvas terlihat dikonversi ke koordinat piksel sumber
+        - Saat zoom < 100%, buffer di-subsample (step) sebelum kuantisasi
+        - Scrollregion tetap seukuran gambar penuh"""
+        h, w = self.float_buf.shape[:2]
+        new_w = max(1, int(w * self.zoom_scale))
+        new_h = max(1, int(h * self.zoom_scale))
+        step = max(1, int(1 / self.zoom_scale))
+
+        self.canvas.delete("all")
+        cw, ch = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if cw < 10: cw, ch = 800, 600
+        self.canvas.config(scrollregion=(0, 0, new_w, new_h))
+
+        if new_w < cw and new_h < ch:
+            # Seluruh gambar terlihat dan diposisikan di tengah
+            x0, y0, x1, y1 = 0, 0, w, h
+        else:
+            # Hanya ambil potongan buffer yang masuk viewport (+1 piksel margin)
+            x0 = max(0, int(self.canvas.canvasx(0) / self.zoom_scale) - 1)
+            y0 = max(0, int(self.canvas.canvasy(0) / self.zoom_scale) - 1)
+            x1 = min(w, int(self.canvas.canvasx(cw) / self.zoom_scale) + 2)
+            y1 = min(h, int(self.canvas.canvasy(ch) / self.zoom_scale) + 2)
+            if x1 <= x0 or y1 <= y0: return
+
+        region = self.quantize(self.float_buf[y0:y1:step, x0:x1:step])
+        disp_w = max(1, int((x1 - x0) * self.zoom_scale))
+        disp_h = max(1, int((y1 - y0) * self.zoom_scale))
+        self.tk_img = ImageTk.PhotoImage(region.resize((disp_w, disp_h), Image.Resampling.LANCZOS))
+
+        if new_w < cw and new_h < ch:
+            self.canvas.create_image(cw//2, ch//2, anchor=tk.CENTER, image=self.tk_img)
+        else:
+            self.canvas.create_image(int(x0 * self.zoom_scale), int(y0 * self.zoom_scale),
+                                     anchor=tk.NW, image=self.tk_img)
+
     # -------------------------------------------------------------
     # UI BUILDERS
     # -------------------------------------------------------------
@@ -225,6 +381,10 @@ class ImageApp:
         self.notebook.add(self.tab_geo, text="Geometri")
         self.build_geo_tab()
 
+        self.tab_metrics = tk.Frame(self.notebook, bg="white", padx=10, pady=10)
+        self.notebook.add(self.tab_metrics, text="Metrik")
+        self.build_metrics_tab()
+
     # -------------------------------------------------------------
     # NEW FEATURE: BOOLEAN TAB (Updated for Colors)
     # -------------------------------------------------------------
@@ -348,6 +508,181 @@ class ImageApp:
         self.entry_crop_r = tk.Entry(f_crop, width=3); self.entry_crop_r.insert(0, "0"); self.entry_crop_r.pack(side="left", padx=1)
         tk.Button(self.tab_geo, text="Crop", command=lambda: self.process_with_thread(self.geo_crop)).pack(fill="x", pady=5)
 
+    # -------------------------------------------------------------
+    # NEW FEATURE: QUALITY METRICS TAB
+    # -------------------------------------------------------------
+    def build_metrics_tab(self):
+        """Bangun tab metrik kualitas:
+        - Bandingkan Original vs Hasil, atau folder output batch vs folder referensi
+        - Tampilkan MSE, PSNR, SSIM dan heatmap perbedaan per tile
+        - Export hasil terakhir ke JSON untuk regression check"""
+        tk.Label(self.tab_metrics, text="Kualitas Citra", bg="white", font=("Arial", 10, "bold")).pack(anchor="w")
+        tk.Label(self.tab_metrics, text="MSE, PSNR, SSIM (blok 8x8 luma)", 
+                 bg="white", fg="gray", justify=tk.LEFT).pack(anchor="w", pady=(0,5))
+
+        tk.Button(self.tab_metrics, text="Original vs Hasil", command=lambda: self.process_with_thread(self.op_metrics)).pack(fill="x", pady=2)
+        tk.Button(self.tab_metrics, text="Batch (Output vs Referensi)...", command=self.metrics_batch).pack(fill="x", pady=2)
+        tk.Button(self.tab_metrics, text="Export JSON", command=self.export_metrics).pack(fill="x", pady=2)
+
+        ttk.Separator(self.tab_metrics, orient='horizontal').pack(fill='x', pady=8)
+        self.txt_metrics = tk.Text(self.tab_metrics, height=8, width=36, font=("Consolas", 9), state=tk.DISABLED)
+        self.txt_metrics.pack(fill="x")
+
+        tk.Label(self.tab_metrics, text="Heatmap Perbedaan (MSE per tile)", bg="white").pack(anchor="w", pady=(8,0))
+        self.lbl_heatmap = tk.Label(self.tab_metrics, bg="white")
+        self.lbl_heatmap.pack(pady=5)
+
+    def metrics_batch(self):
+        """Pilih folder output dan folder referensi (di thread utama), lalu hitung metrik via thread.
+        File dipasangkan berdasarkan nama file yang sama"""
+        out_dir = filedialog.askdirectory(title="Folder Output Batch")
+        if not out_dir: return
+        ref_dir = filedialog.askdirectory(title="Folder Referensi")
+        if not ref_dir: return
+        self.process_with_thread(self.op_metrics_batch, out_dir, ref_dir)
+
+    def compute_metrics(self, img_a, img_b):
+        """Hitung MSE, PSNR, SSIM dan heatmap MSE per tile secara streaming:
+        - Gambar diproses per tile (metrics_tile x metrics_tile), hanya satu pasang tile float di memori
+        - MSE/PSNR dari seluruh channel RGB, SSIM dari luma dengan blok 8x8 tanpa overlap
+        - PSNR None jika gambar identik (MSE = 0)"""
+        if np is None:
+            raise RuntimeError("Install numpy untuk fitur metrik kualitas")
+        if img_a.size != img_b.size:
+            raise ValueError(f"Ukuran gambar berbeda: {img_a.size} vs {img_b.size}")
+
+        w, h = img_a.size
+        tile = self.metrics_tile
+        c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+        luma_w = np.array([0.299, 0.587, 0.114])
+
+        sq_sum, n_values = 0.0, 0
+        ssim_sum, n_blocks = 0.0, 0
+        heatmap = []
+        for top in range(0, h, tile):
+            row = []
+            for left in range(0, w, tile):
+                box = (left, top, min(left + tile, w), min(top + tile, h))
+                a = np.asarray(img_a.crop(box).convert("RGB"), dtype=np.float64)
+                b = np.asarray(img_b.crop(box).convert("RGB"), dtype=np.float64)
+
+                diff = a - b
+                se = float(np.einsum("ijk,ijk->", diff, diff))
+                sq_sum += se
+                n_values += diff.size
+                row.append(se / diff.size)
+
+                # SSIM: luma tile dipecah menjadi blok 8x8 (sisa tepi < 8 piksel dilewati)
+                th, tw = (a.shape[0] // 8) * 8, (a.shape[1] // 8) * 8
+                if th and tw:
+                    la = (a[:th, :tw] @ luma_w).reshape(th // 8, 8, tw // 8, 8)
+                    lb = (b[:th, :tw] @ luma_w).reshape(th // 8, 8, tw // 8, 8)
+                    mu_a, mu_b = la.mean(axis=(1, 3)), lb.mean(axis=(1, 3))
+                    var_a, var_b = la.var(axis=(1, 3)), lb.var(axis=(1, 3))
+                    cov = (la * lb).mean(axis=(1, 3)) - mu_a * mu_b
+                    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / \
+                               ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+                    ssim_sum += float(ssim_map.sum())
+                    n_blocks += ssim_map.size
+            heatmap.append(row)
+
+        mse = sq_sum / n_values
+        return {
+            "width": w,
+            "height": h,
+            "tile_size": tile,
+            "mse": mse,
+            "psnr": 10 * math.log10(255 ** 2 / mse) if mse > 0 else None,
+            "ssim": ssim_sum / n_blocks if n_blocks else None,
+            "heatmap": heatmap,
+        }
+
+    def op_metrics(self):
+        """Bandingkan img_original dengan img_processed lalu tampilkan hasil di tab Metrik"""
+        if not self.img_original or not self.img_processed: return
+        result = self.compute_metrics(self.img_original, self.img_processed)
+        result["name"] = os.path.basename(self.current_filepath) if self.current_filepath else "processed"
+        self.last_metrics = {"mode": "single", "results": [result]}
+        self.root.after(0, self.show_metrics)
+
+    def op_metrics_batch(self, out_dir, ref_dir):
+        """Bandingkan setiap gambar di out_dir dengan file bernama sama di ref_dir.
+        File tanpa pasangan atau yang gagal diproses dicatat dengan field 'error'.
+        Catatan: crop pertama memaksa Pillow men-decode kedua file secara penuh (~3 byte/piksel
+        per gambar); hanya perhitungan metrik yang dibatasi per tile"""
+        exts = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+        results = []
+        for name in sorted(os.listdir(out_dir)):
+            if not name.lower().endswith(exts): continue
+            ref_path = os.path.join(ref_dir, name)
+            if not os.path.exists(ref_path):
+                results.append({"name": name, "error": "Referensi tidak ditemukan"})
+                continue
+            try:
+                with Image.open(os.path.join(out_dir, name)) as img_out, Image.open(ref_path) as img_ref:
+                    result = self.compute_metrics(img_ref, img_out)
+            except Exception as e:
+                results.append({"name": name, "error": str(e)})
+                continue
+            result["name"] = name
+            results.append(result)
+
+        self.last_metrics = {"mode": "batch", "output_dir": out_dir, "reference_dir": ref_dir, "results": results}
+        self.root.after(0, self.show_metrics)
+
+    def show_metrics(self):
+        """Tampilkan hasil metrik terakhir di teks tab Metrik dan render heatmap
+        (untuk batch: heatmap dari file dengan MSE tertinggi)"""
+        if not self.last_metrics: return
+        lines = []
+        for r in self.last_metrics["results"]:
+            lines.append(r["name"])
+            if "error" in r:
+                lines.append(f"  Error: {r['error']}")
+                continue
+            psnr = "∞" if r["psnr"] is None else f"{r['psnr']:.2f} dB"
+            ssim = "-" if r["ssim"] is None else f"{r['ssim']:.4f}"
+            lines.append(f"  MSE : {r['mse']:.4f}")
+            lines.append(f"  PSNR: {psnr}")
+            lines.append(f"  SSIM: {ssim}")
+
+        self.txt_metrics.config(state=tk.NORMAL)
+        self.txt_metrics.delete("1.0", tk.END)
+        self.txt_metrics.insert(tk.END, "\n".join(lines) if lines else "Tidak ada gambar yang dibandingkan")
+        self.txt_metrics.config(state=tk.DISABLED)
+
+        valid = [r for r in self.last_metrics["results"] if "error" not in r]
+        if not valid:
+            self.lbl_heatmap.config(image="")
+            return
+        worst = max(valid, key=lambda r: r["mse"])
+        self.tk_heatmap = ImageTk.PhotoImage(self.render_heatmap(worst["heatmap"]))
+        self.lbl_heatmap.config(image=self.tk_heatmap)
+
+    def render_heatmap(self, heatmap, max_side=280):
+        """Ubah grid MSE per tile menjadi PIL Image berwarna (biru = sama, merah = beda)
+        - Nilai dinormalisasi terhadap MSE tile terbesar
+        - Diperbesar dengan NEAREST agar setiap tile tetap terlihat sebagai kotak"""
+        grid = np.array(heatmap, dtype=np.float64)
+        peak = grid.max()
+        if peak > 0: grid = grid / peak * 255
+        gray = Image.fromarray(grid.astype(np.uint8), "L")
+        color = ImageOps.colorize(gray, black="#000080", white="#ff0000", mid="#ffff00")
+        rows, cols = grid.shape
+        scale = max(1, max_side // max(rows, cols))
+        return color.resize((cols * scale, rows * scale), Image.Resampling.NEAREST)
+
+    def export_metrics(self):
+        """Simpan hasil metrik terakhir ke file JSON"""
+        if not self.last_metrics:
+            messagebox.showinfo("Metrik", "Belum ada hasil metrik. Hitung metrik terlebih dahulu.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.last_metrics, f, indent=2)
+            messagebox.showinfo("Saved", "Metrics exported successfully!")
+
     # -------------------------------------------------------------
     # LOGIC: BOOLEAN (UPDATED TO USE COLORS)
     # -------------------------------------------------------------
@@ -394,6 +729,9 @@ class ImageApp:
     # -------------------------------------------------------------
     def open_image(self):
         """Buka dialog file, load image ke img_original dan img_processed, reset history dan zoom"""
+        if self.is_processing:
+            messagebox.showwarning("Processing", "Please wait for current operation to complete.")
+            return
         path = filedialog.askopenfilename(filetypes=[("Images", "*.png *.jpg *.jpeg *.bmp *.webp")])
         if path:
             try:
@@ -403,6 +741,7 @@ class ImageApp:
                 self.current_filepath = path
                 self.history.clear()
                 self.zoom_scale = 1.0
+                self.reload_float_buffer(force=True)
                 self.display_image()
                 self.update_image_info()
             except Exception as e:
@@ -411,9 +750,14 @@ class ImageApp:
     def save_image(self):
         """Simpan img_processed ke file via Save As dialog. Update current_filepath dan info file"""
         if not self.img_processed: return
+        if self.is_processing:
+            messagebox.showwarning("Processing", "Please wait for current operation to complete.")
+            return
         path = filedialog.asksaveasfilename(defaultextension=".jpg", 
                                             filetypes=[("JPG", "*.jpg"), ("PNG", "*.png"), ("BMP", "*.bmp")])
         if path:
+            # Kuantisasi buffer float hanya saat disimpan
+            self.sync_processed()
             self.img_processed.save(path)
             self.current_filepath = path
             self.update_image_info()
@@ -421,9 +765,13 @@ class ImageApp:
 
     def reset_image(self):
         """Reset gambar hasil ke image original (simpan dulu ke history)"""
+        if self.is_processing:
+            messagebox.showwarning("Processing", "Please wait for current operation to complete.")
+            return
         if self.img_original:
             self.save_history()
             self.img_processed = self.img_original.copy()
+            self.reload_float_buffer()
             self.display_image()
             self.update_image_info()
 
@@ -437,6 +785,12 @@ class ImageApp:
 
         # Update label zoom
         self.lbl_zoom.config(text=f"{int(self.zoom_scale * 100)}%")
+
+        # Buffer float lebih baru: render langsung dari buffer (hanya area terlihat)
+        if self.float_buf is not None and self.float_dirty:
+            self.display_float_view()
+            return
+
         img_disp = self.img_processed.resize((new_w, new_h), Image.Resampling.LANCZOS)
         self.tk_img = ImageTk.PhotoImage(img_disp)
         
@@ -500,34 +854,73 @@ class ImageApp:
             self.root.after(0, self.display_image)
 
     def op_brightness(self):
-        """Atur brightness dengan ImageEnhance"""
+        """Atur brightness dengan ImageEnhance (mode float: buf *= factor)"""
         if self.img_processed:
             self.save_history()
             factor = self.scale_bright.get()
+            if self.float_buf is not None:
+                self.float_buf *= factor
+                self.mark_float_changed()
+                return
             self.img_processed = ImageEnhance.Brightness(self.img_processed).enhance(factor)
             self.root.after(0, self.display_image)
 
     def op_saturation(self):
-        """Atur saturasi (color) dengan ImageEnhance"""
+        """Atur saturasi (color) dengan ImageEnhance (mode float: interpolasi terhadap luma)"""
         if self.img_processed:
             self.save_history()
             factor = self.scale_sat.get()
+            if self.float_buf is not None:
+                luma = self.float_luma()[..., None]
+                self.float_buf -= luma
+                self.float_buf *= factor
+                self.float_buf += luma
+                self.mark_float_changed()
+                return
             self.img_processed = ImageEnhance.Color(self.img_processed).enhance(factor)
             self.root.after(0, self.display_image)
 
     def op_contrast(self):
-        """Atur kontras dengan ImageEnhance"""
+        """Atur kontras dengan ImageEnhance (mode float: interpolasi terhadap rata-rata luma)"""
         if self.img_processed:
             self.save_history()
             factor = self.scale_contrast.get()
+            if self.float_buf is not None:
+                # Rata-rata luma = kombinasi linear rata-rata tiap channel (tanpa array luma penuh)
+                ch_mean = self.float_buf.mean(axis=(0, 1), dtype=np.float64)
+                mean = float(ch_mean @ np.array([0.299, 0.587, 0.114]))
+                self.float_buf -= mean
+                self.float_buf *= factor
+                self.float_buf += mean
+                self.mark_float_changed()
+                return
             self.img_processed = ImageEnhance.Contrast(self.img_processed).enhance(factor)
             self.root.after(0, self.display_image)
 
     def op_sharpness(self):
-        """Atur ketajaman dengan ImageEnhance"""
+        """Atur ketajaman dengan ImageEnhance (mode float: interpolasi terhadap hasil kernel SMOOTH 3x3,
+        piksel tepi tidak diubah seperti pada Pillow)"""
         if self.img_processed:
+            # Kernel 3x3 butuh minimal 3x3 piksel; cek sebelum save_history agar tidak ada undo kosong
+            if self.float_buf is not None and min(self.float_buf.shape[:2]) < 3: return
             self.save_history()
             factor = self.scale_sharp.get()
+            if self.float_buf is not None:
+                buf = self.float_buf
+                h, w = buf.shape[:2]
+                inner = buf[1:-1, 1:-1]
+                # Kernel SMOOTH Pillow: [[1,1,1],[1,5,1],[1,1,1]] / 13
+                smooth = inner * 5.0
+                for dy in range(3):
+                    for dx in range(3):
+                        if dy == 1 and dx == 1: continue
+                        smooth += buf[dy:h - 2 + dy, dx:w - 2 + dx]
+                smooth /= 13.0
+                inner -= smooth
+                inner *= factor
+                inner += smooth
+                self.mark_float_changed()
+                return
             self.img_processed = ImageEnhance.Sharpness(self.img_processed).enhance(factor)
             self.root.after(0, self.display_image)
 
@@ -558,11 +951,20 @@ class ImageApp:
     def op_math(self, mode):
         """Operasi aritmatika pointwise pada setiap channel:
         - Ambil nilai scalar dari entry, konversi ke float
-        - Gunakan Image.point dengan lambda sesuai mode"""
+        - Gunakan Image.point dengan lambda sesuai mode
+        - Mode float: operasi in-place pada buffer tanpa clamp (mul lalu div tidak kehilangan detail)"""
         if not self.img_processed: return
         try: 
             val = float(self.entry_math.get())
             self.save_history()
+
+            if self.float_buf is not None:
+                if mode == "add": self.float_buf += val
+                elif mode == "sub": self.float_buf -= val
+                elif mode == "mul": self.float_buf *= val
+                elif mode == "div" and val != 0: self.float_buf /= val
+                self.mark_float_changed()
+                return
             
             if mode == "add": self.img_processed = self.img_processed.point(lambda p: min(255, max(0, p + val)))
             elif mode == "sub": self.img_processed = self.img_processed.point(lambda p: min(255, max(0, p - val)))
@@ -642,16 +1044,41 @@ class ImageApp:
 
     def save_history(self):
         """Simpan salinan img_processed ke history untuk undo.
+        - Mode float: simpan salinan buffer float jika isinya tidak bisa direpresentasikan 8-bit
+          (float_lossless False); jika lossless, salinan img_processed (3 byte/piksel) sudah cukup
+        - Hanya float_history_limit snapshot float terbaru yang disimpan sebagai float32,
+          snapshot float yang lebih lama dikuantisasi menjadi Image 8-bit
         - Batasi panjang history ke 20 entry untuk menghemat memori"""
         if self.img_processed:
             if len(self.history) > 20:
                 self.history.pop(0)
-            self.history.append(self.img_processed.copy())
+            if self.float_buf is not None and not self.float_lossless:
+                self.history.append(self.float_buf.copy())
+            else:
+                self.history.append(self.img_processed.copy())
+
+            float_idx = [i for i, state in enumerate(self.history) if not isinstance(state, Image.Image)]
+            for i in float_idx[:-self.float_history_limit]:
+                self.history[i] = self.quantize(self.history[i])
 
     def undo_action(self):
         """Undo: kembalikan state terakhir dari history jika ada"""
+        if self.is_processing:
+            messagebox.showwarning("Processing", "Please wait for current operation to complete.")
+            return
         if self.history:
-            self.img_processed = self.history.pop()
+            state = self.history.pop()
+            if isinstance(state, Image.Image):
+                self.img_processed = state
+                self.reload_float_buffer()
+            elif self.float_buf is not None:
+                # Entry float dan mode float masih aktif: pulihkan buffer tanpa kuantisasi
+                self.float_buf = state
+                self.float_dirty = True
+                self.float_lossless = False
+            else:
+                # Entry float tetapi mode sudah dinonaktifkan
+                self.img_processed = self.quantize(state)
             self.display_image()
             self.update_image_info()
         else:
@@ -666,6 +1093,9 @@ class ImageApp:
         
         width, height = self.img_processed.size
         mode = self.img_processed.mode
+        if self.float_buf is not None:
+            height, width = self.float_buf.shape[:2]
+            mode += " (float32)"
         
         size_info = ""
         if self.current_filepath and os.path.exists(self.current_filepath):